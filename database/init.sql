@@ -52,6 +52,10 @@ ON learning_chunks USING hnsw (embedding vector_cosine_ops);
 CREATE INDEX IF NOT EXISTS learning_chunks_concept_tag_idx 
 ON learning_chunks (concept_tag);
 
+-- Case-insensitive concept lookups filter on lower(concept_tag)
+CREATE INDEX IF NOT EXISTS learning_chunks_concept_tag_lower_idx 
+ON learning_chunks (lower(concept_tag));
+
 -- Create index on doc_source for filtering by document
 CREATE INDEX IF NOT EXISTS learning_chunks_doc_source_idx 
 ON learning_chunks (doc_source);
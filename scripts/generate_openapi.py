@@ -1,31 +1,91 @@
+"""
+Generate the OpenAPI schema for the LearnFast API.
+
+Run from the project root as a module so `main` is importable without
+path manipulation:
+
+    python -m scripts.generate_openapi [--json] [--force]
+"""
 import sys
 import os
+from functools import lru_cache
+from glob import glob
+
 import yaml
-from fastapi.openapi.utils import get_openapi
 
-# Setup path to include project root
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
+try:
+    from yaml import CSafeDumper as SchemaDumper
+except ImportError:  # libyaml not available
+    from yaml import SafeDumper as SchemaDumper
+
+try:
+    import orjson
+except ImportError:  # orjson not installed, fall back to stdlib json
+    orjson = None
+    import json
 
-# Import app after path setup
 from main import app
 
-def generate_openapi():
-    openapi_schema = get_openapi(
-        title=app.title,
-        version=app.version,
-        openapi_version=app.openapi_version,
-        description=app.description,
-        routes=app.routes,
-    )
-    
-    output_path = "openapi.yaml"
-    # os.makedirs("docs", exist_ok=True) # Not needed for root
-    
-    with open(output_path, "w") as f:
-        yaml.dump(openapi_schema, f, sort_keys=False)
-    
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OUTPUT_PATH = os.path.join(project_root, "openapi.yaml")
+JSON_OUTPUT_PATH = os.path.join(project_root, "openapi.json")
+
+
+@lru_cache(maxsize=1)
+def _schema():
+    """Build the OpenAPI schema once; FastAPI also memoizes it on app.openapi_schema."""
+    return app.openapi()
+
+
+def _latest_source_mtime() -> float:
+    """Most recent modification time across the API source tree."""
+    sources = glob(os.path.join(project_root, "src", "**", "*.py"), recursive=True)
+    sources.append(os.path.join(project_root, "main.py"))
+    return max(os.path.getmtime(p) for p in sources if os.path.exists(p))
+
+
+def _is_up_to_date(output_path: str) -> bool:
+    """True if the schema file exists and is newer than every source file."""
+    if not os.path.exists(output_path):
+        return False
+    return os.path.getmtime(output_path) >= _latest_source_mtime()
+
+
+def _write_json(schema, output_path: str):
+    """Write the schema as JSON, which most OpenAPI tooling accepts directly."""
+    if orjson is not None:
+        with open(output_path, "wb") as f:
+            f.write(orjson.dumps(schema, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, "w") as f:
+            json.dump(schema, f, indent=2)
+
+
+def generate_openapi(output_path: str = OUTPUT_PATH, force: bool = False):
+    if not force and _is_up_to_date(output_path):
+        print(f"OpenAPI schema at {output_path} is up to date")
+        return
+
+    openapi_schema = _schema()
+
+    if output_path.endswith(".json"):
+        _write_json(openapi_schema, output_path)
+    else:
+        with open(output_path, "w") as f:
+            yaml.dump(
+                openapi_schema,
+                f,
+                Dumper=SchemaDumper,
+                sort_keys=False,
+                default_flow_style=False,
+            )
+
     print(f"OpenAPI schema generated at {output_path}")
 
 if __name__ == "__main__":
-    generate_openapi()
+    args = sys.argv[1:]
+    generate_openapi(
+        output_path=JSON_OUTPUT_PATH if "--json" in args else OUTPUT_PATH,
+        force="--force" in args,
+    )
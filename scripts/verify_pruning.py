@@ -1,7 +1,6 @@
 
 import asyncio
 from src.path_resolution.content_retriever import ContentRetriever
-from src.models.schemas import LearningChunk
 
 async def verify_pruning():
     results = []
@@ -11,14 +10,15 @@ async def verify_pruning():
     concept_a = "mitochondria"
     concept_b = "atp_production"
     
-    def mock_retrieve(concept):
-        if concept == concept_a:
-            return [LearningChunk(id=1, doc_source="bio101", content="Mitochondria part", concept_tag=concept_a)]
-        if concept == concept_b:
-            return [LearningChunk(id=2, doc_source="bio101", content="ATP part", concept_tag=concept_b)]
-        return []
+    contents = {
+        concept_a: [("bio101", "Mitochondria part")],
+        concept_b: [("bio101", "ATP part")],
+    }
 
-    retriever.retrieve_chunks_by_concept = mock_retrieve
+    def mock_retrieve(concepts):
+        return {c: contents[c] for c in concepts if c in contents}
+
+    retriever.retrieve_contents_by_concepts = mock_retrieve
     
     # Mock LLM rewrite
     async def mock_rewrite(target, budget, raw, completed):
@@ -0,0 +1,77 @@
+"""
+In-process caching utilities.
+
+Provides a small thread-safe LRU cache with per-entry expiry, used to keep
+read-hot, write-rare database results (e.g. learning chunks) in memory.
+"""
+import time
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after `ttl` seconds.
+
+    Safe to share between request threads. Cached values may be falsy
+    (e.g. an empty list), so `get` takes an explicit default for misses.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= self._timer():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = (self._timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """Drop a single entry if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        """Drop every entry whose key satisfies predicate."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# learning_chunks rows keyed by lowercased concept tag. Invalidated by VectorStorage writes.
+chunk_cache = TTLCache(maxsize=2048, ttl=300)
+
+# Chunk counts per lowercased concept tag, used for time estimates. Invalidated alongside chunk_cache.
+chunk_count_cache = TTLCache(maxsize=4096, ttl=300)
+
+# resolve_path results keyed by (user_id, target, budget). Cleared by GraphStorage writes;
+# a user's entries are dropped when they complete a concept.
+path_cache = TTLCache(maxsize=10_000, ttl=300)
@@ -46,6 +46,11 @@ class Settings(BaseSettings):
     extraction_context_window: int = 100000
     rewrite_model: Optional[str] = None
     rewrite_context_window: int = 10000
+
+    # YouTube transcript cache (set TRANSCRIPT_CACHE_ENABLED=false to force refetch)
+    transcript_cache_enabled: bool = True
+    transcript_cache_dir: str = "./.cache/transcripts"
+    transcript_cache_ttl: int = 24 * 60 * 60  # seconds
     
     class Config:
         """Pydantic configuration dict."""
@@ -1,7 +1,9 @@
 """Database connection utilities for Neo4j and PostgreSQL."""
 
 import os
-from typing import Optional
+import uuid
+import threading
+from typing import Dict, Iterator, Optional, Sequence
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from neo4j import GraphDatabase, Driver
@@ -58,6 +60,12 @@ class PostgreSQLConnection:
         self.user = user or os.getenv("POSTGRES_USER", "learnfast")
         self.password = password or os.getenv("POSTGRES_PASSWORD", "password")
         self._connection = None
+        # Registered statements (name -> PREPARE text) and which ones exist on the live connection
+        self._statements: Dict[str, str] = {}
+        self._prepared_on = None
+        self._prepared = set()
+        # The instance is shared across request threads; serializes check-then-PREPARE
+        self._prepare_lock = threading.Lock()
     
     def connect(self):
         """Establish connection to PostgreSQL database."""
@@ -104,6 +112,86 @@ class PostgreSQLConnection:
                 self.close()
             raise e
     
+    def execute_query_stream(self, query: str, parameters: Optional[tuple] = None, itersize: int = 500) -> Iterator[dict]:
+        """
+        Execute a SELECT through a server-side (named) cursor and yield rows lazily.
+        
+        Rows are pulled from the server `itersize` at a time, so client memory
+        stays bounded only if the caller consumes rows without keeping them.
+        Costs extra round trips (DECLARE/FETCH/CLOSE) over execute_query and
+        holds the shared connection's transaction open until the generator is
+        exhausted or closed, so use it only for large, one-pass reads.
+        """
+        conn = self.connect()
+        try:
+            with conn.cursor(name=f"stream_{uuid.uuid4().hex}") as cursor:
+                cursor.itersize = itersize
+                cursor.execute(query, parameters or ())
+                yield from cursor
+        except Exception as e:
+            if "transaction is aborted" in str(e):
+                self.close()
+            raise e
+        finally:
+            # Also runs on early close() (GeneratorExit), which except Exception misses;
+            # the read-only transaction is ended either way
+            if not conn.closed:
+                conn.rollback()
+    
+    def prepare(self, name: str, query: str, arg_types: Sequence[str] = ()):
+        """
+        Register a server-side prepared statement.
+        
+        The statement is PREPAREd lazily on first use and re-prepared after a
+        reconnect, so Postgres parses and plans it once per session.
+        
+        Args:
+            name: Statement identifier
+            query: SQL using $1, $2, ... placeholders
+            arg_types: Postgres types of the parameters, e.g. ("text",)
+        """
+        types = f"({', '.join(arg_types)})" if arg_types else ""
+        self._statements[name] = f"PREPARE {name}{types} AS {query}"
+    
+    def _ensure_prepared(self, name: str):
+        """PREPARE a registered statement on the current connection if needed."""
+        with self._prepare_lock:
+            conn = self.connect()
+            if self._prepared_on is not conn:
+                self._prepared_on = conn
+                self._prepared = set()
+            if name in self._prepared:
+                return
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(self._statements[name])
+                # Commit so the PREPARE is not tied to a later rollback
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            self._prepared.add(name)
+    
+    def execute_prepared(self, name: str, parameters: Optional[tuple] = None):
+        """Execute a read-only statement registered with prepare() and return results."""
+        if name not in self._statements:
+            raise KeyError(f"Prepared statement '{name}' is not registered")
+        self._ensure_prepared(name)
+        placeholders = ", ".join(["%s"] * len(parameters or ()))
+        args = f"({placeholders})" if placeholders else ""
+        conn = self.connect()
+        try:
+            # Registered statements are reads, so no commit (execute_query would
+            # commit anything not starting with SELECT, EXECUTE included)
+            with conn.cursor() as cursor:
+                cursor.execute(f"EXECUTE {name}{args}", parameters or ())
+                return cursor.fetchall() if cursor.description else cursor.rowcount
+        except Exception as e:
+            conn.rollback()
+            if "transaction is aborted" in str(e):
+                self.close()
+            raise e
+    
     def execute_many(self, query: str, parameters_list: list):
         """Execute a SQL query with multiple parameter sets."""
         conn = self.connect()
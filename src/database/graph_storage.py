@@ -1,14 +1,29 @@
 """Knowledge graph storage operations for Neo4j database."""
 
 import logging
+import re
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
+from src.cache import path_cache
 from src.models.schemas import GraphSchema, PrerequisiteLink, ConceptNode, UserNode, UserState
 from .connections import neo4j_conn
 
 logger = logging.getLogger(__name__)
 
+# Labels can't be bound as query parameters, so extra labels are restricted to plain identifiers
+_LABEL_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _label_clause(extra_labels: Optional[List[str]]) -> str:
+    """Build a `SET c:Label...` clause for extra node labels, rejecting anything that isn't an identifier."""
+    if not extra_labels:
+        return ""
+    for label in extra_labels:
+        if not _LABEL_RE.match(label):
+            raise ValueError(f"Invalid node label: {label!r}")
+    return "SET c" + "".join(f":`{label}`" for label in extra_labels)
+
 
 class GraphStorage:
     """
@@ -125,7 +140,8 @@ class GraphStorage:
             except Exception:
                 pass  # Ignore cleanup errors
     
-    def store_concept(self, concept: ConceptNode, document_id: Optional[int] = None) -> bool:
+    def store_concept(self, concept: ConceptNode, document_id: Optional[int] = None,
+                      extra_labels: Optional[List[str]] = None) -> bool:
         """
         Store a single concept using MERGE to handle duplicates gracefully.
         
@@ -135,6 +151,7 @@ class GraphStorage:
         Args:
             concept: ConceptNode to store
             document_id: Optional ID of the document this concept was extracted from
+            extra_labels: Optional labels added alongside :Concept (e.g. to scope test data)
             
         Returns:
             True if concept was stored successfully
@@ -145,14 +162,16 @@ class GraphStorage:
         if not concept.name or not concept.name.strip():
             raise ValueError("Concept name cannot be empty")
         
+        label_clause = _label_clause(extra_labels)
+        
         try:
             # Normalize concept name to lowercase (Requirements 6.3)
-            normalized_name = concept.name.strip().lower()
+            normalized_name = concept.name_lc
             
             # Use MERGE to handle duplicates gracefully (Requirements 6.5)
             # Track document provenance in source_docs list
-            query = """
-                MERGE (c:Concept {name: $name})
+            query = f"""
+                MERGE (c:Concept {{name: $name}})
                 ON CREATE SET 
                     c.description = $description,
                     c.depth_level = $depth_level,
@@ -167,6 +186,7 @@ class GraphStorage:
                         THEN c.source_docs + $doc_id 
                         ELSE c.source_docs 
                     END
+                {label_clause}
                 RETURN c.name as name
             """
             
@@ -178,6 +198,7 @@ class GraphStorage:
             })
             
             if result:
+                path_cache.clear()
                 logger.debug(f"Stored concept: {normalized_name}")
                 return True
             else:
@@ -188,31 +209,75 @@ class GraphStorage:
             logger.error(f"Error storing concept '{concept.name}': {str(e)}")
             raise ValueError(f"Failed to store concept: {str(e)}") from e
     
-    def store_concepts_batch(self, concepts: List[ConceptNode], document_id: Optional[int] = None) -> int:
+    def store_concepts_batch(self, concepts: List[ConceptNode], document_id: Optional[int] = None,
+                             extra_labels: Optional[List[str]] = None) -> int:
         """
-        Store multiple concepts in a batch operation.
+        Store multiple concepts in a single UNWIND query.
+        
+        Same MERGE semantics and provenance tracking as store_concept, but one
+        round trip for the whole list. Concepts with empty names are skipped
+        with a warning.
         
         Args:
             concepts: List of ConceptNode objects to store
             document_id: Optional ID of the document these concepts were extracted from
+            extra_labels: Optional labels added to every stored concept
             
         Returns:
-            Number of concepts successfully stored
+            Number of concepts created or updated
         """
         if not concepts:
             return 0
         
-        stored_count = 0
+        label_clause = _label_clause(extra_labels)
+        
+        rows = []
         for concept in concepts:
-            try:
-                if self.store_concept(concept, document_id):
-                    stored_count += 1
-            except Exception as e:
-                logger.warning(f"Failed to store concept in batch: {str(e)}")
+            if not concept.name or not concept.name.strip():
+                logger.warning("Skipping concept with empty name in batch")
                 continue
+            rows.append({
+                "name": concept.name.strip().lower(),
+                "description": concept.description,
+                "depth_level": concept.depth_level
+            })
         
-        logger.info(f"Stored {stored_count}/{len(concepts)} concepts in batch")
-        return stored_count
+        if not rows:
+            return 0
+        
+        try:
+            query = f"""
+                UNWIND $concepts AS concept
+                MERGE (c:Concept {{name: concept.name}})
+                ON CREATE SET
+                    c.description = concept.description,
+                    c.depth_level = concept.depth_level,
+                    c.created_at = datetime(),
+                    c.source_docs = CASE WHEN $doc_id IS NOT NULL THEN [$doc_id] ELSE [] END
+                ON MATCH SET
+                    c.description = COALESCE(concept.description, c.description),
+                    c.depth_level = COALESCE(concept.depth_level, c.depth_level),
+                    c.updated_at = datetime(),
+                    c.source_docs = CASE
+                        WHEN $doc_id IS NOT NULL AND NOT $doc_id IN c.source_docs
+                        THEN c.source_docs + $doc_id
+                        ELSE c.source_docs
+                    END
+                {label_clause}
+                RETURN count(c) as count
+            """
+            
+            result = self.connection.execute_query(query, {"concepts": rows, "doc_id": document_id})
+            stored_count = result[0]["count"] if result else 0
+            if stored_count:
+                path_cache.clear()
+            
+            logger.info(f"Stored {stored_count}/{len(concepts)} concepts in batch")
+            return stored_count
+            
+        except Exception as e:
+            logger.error(f"Error storing concepts batch: {str(e)}")
+            raise ValueError(f"Failed to store concepts batch: {str(e)}") from e
     
     def store_prerequisite_relationship(self, prerequisite: PrerequisiteLink, document_id: Optional[int] = None) -> bool:
         """
@@ -290,6 +355,7 @@ class GraphStorage:
             })
             
             if result:
+                path_cache.clear()
                 logger.debug(f"Stored prerequisite: {source_name} -> {target_name} (weight: {prerequisite.weight})")
                 return True
             else:
@@ -299,7 +365,75 @@ class GraphStorage:
         except Exception as e:
             logger.error(f"Error storing prerequisite relationship: {str(e)}")
             raise ValueError(f"Failed to store prerequisite relationship: {str(e)}") from e
-    
+
+    def store_prerequisite_relationships_batch(self, prerequisites: List[PrerequisiteLink], document_id: Optional[int] = None) -> int:
+        """
+        Store multiple prerequisite relationships in a single UNWIND query.
+
+        Same MERGE semantics as store_prerequisite_relationship, but one round
+        trip for the whole list. Invalid links are skipped with a warning, and
+        links whose concepts don't exist are silently not created.
+
+        Args:
+            prerequisites: List of PrerequisiteLink objects to store
+            document_id: Optional ID of the document these relationships were extracted from
+
+        Returns:
+            Number of relationships created or updated
+        """
+        links = []
+        for prerequisite in prerequisites:
+            if not prerequisite.source_concept or not prerequisite.target_concept:
+                logger.warning("Skipping prerequisite with empty source or target in batch")
+                continue
+            if prerequisite.weight < 0.0 or prerequisite.weight > 1.0:
+                logger.warning(f"Skipping prerequisite with out-of-range weight {prerequisite.weight} in batch")
+                continue
+            links.append({
+                "source_name": prerequisite.source_concept.strip().lower(),
+                "target_name": prerequisite.target_concept.strip().lower(),
+                "weight": prerequisite.weight,
+                "reasoning": prerequisite.reasoning
+            })
+
+        if not links:
+            return 0
+
+        try:
+            query = """
+                UNWIND $links AS link
+                MATCH (source:Concept {name: link.source_name})
+                MATCH (target:Concept {name: link.target_name})
+                MERGE (source)-[r:PREREQUISITE]->(target)
+                ON CREATE SET
+                    r.weight = link.weight,
+                    r.reasoning = link.reasoning,
+                    r.created_at = datetime(),
+                    r.source_docs = CASE WHEN $doc_id IS NOT NULL THEN [$doc_id] ELSE [] END
+                ON MATCH SET
+                    r.weight = link.weight,
+                    r.reasoning = link.reasoning,
+                    r.updated_at = datetime(),
+                    r.source_docs = CASE
+                        WHEN $doc_id IS NOT NULL AND NOT $doc_id IN r.source_docs
+                        THEN r.source_docs + $doc_id
+                        ELSE r.source_docs
+                    END
+                RETURN count(r) as count
+            """
+
+            result = self.connection.execute_query(query, {"links": links, "doc_id": document_id})
+            stored_count = result[0]["count"] if result else 0
+            if stored_count:
+                path_cache.clear()
+
+            logger.info(f"Stored {stored_count}/{len(prerequisites)} prerequisites in batch")
+            return stored_count
+
+        except Exception as e:
+            logger.error(f"Error storing prerequisite relationships batch: {str(e)}")
+            raise ValueError(f"Failed to store prerequisite relationships batch: {str(e)}") from e
+
     def store_graph_schema(self, schema: GraphSchema, document_id: Optional[int] = None) -> Dict[str, int]:
         """
         Store complete graph schema with concepts and prerequisite relationships.
@@ -477,6 +611,7 @@ class GraphStorage:
             """
             node_result = self.connection.execute_query(node_query, {"doc_id": document_id})
             deleted_nodes = node_result[0]["deleted_nodes"] if node_result else 0
+            path_cache.clear()
             
             logger.info(f"Cleanup for doc {document_id}: deleted {deleted_nodes} nodes, {deleted_rels} relationships")
             return {
@@ -499,6 +634,7 @@ class GraphStorage:
         """
         try:
             self.connection.execute_write_query("MATCH (n) DETACH DELETE n")
+            path_cache.clear()
             logger.info("Cleared all data from knowledge graph")
             return True
         except Exception as e:
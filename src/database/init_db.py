@@ -100,6 +100,47 @@ def migrate_documents_table():
             pass
 
 
+def migrate_learning_chunks_indexes():
+    """
+    Create indexes added after the initial schema on existing databases.
+    
+    Concept lookups filter on lower(concept_tag), which the plain concept_tag
+    index cannot serve. CREATE INDEX CONCURRENTLY avoids locking writes on a
+    populated table but cannot run inside a transaction, so autocommit is
+    enabled for the duration.
+    
+    A concurrent build that fails partway leaves an INVALID index behind,
+    which IF NOT EXISTS would then skip forever, so an invalid index is
+    dropped and rebuilt.
+    """
+    index_name = "learning_chunks_concept_tag_lower_idx"
+    try:
+        conn = postgres_conn.connect()
+        conn.commit()  # Close any open transaction before switching modes
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)",
+                    (index_name,)
+                )
+                row = cursor.fetchone()
+                if row is not None and not row['indisvalid']:
+                    print(f"Rebuilding invalid index {index_name}")
+                    cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+                cursor.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+                    "ON learning_chunks (lower(concept_tag))"
+                )
+        finally:
+            conn.autocommit = False
+        print("learning_chunks indexes verified")
+        return True
+    except Exception as e:
+        print(f"learning_chunks index migration failed: {e}")
+        return False
+
+
 def initialize_databases():
     """Initialize both Neo4j and PostgreSQL databases."""
     print("Initializing databases...")
@@ -115,6 +156,9 @@ def initialize_databases():
     # Verify PostgreSQL schema
     if not verify_postgres_schema():
         return False
+
+    # Non-fatal: lookups still work without the index, just slower
+    migrate_learning_chunks_indexes()
         
     # Initialize ORM tables
     if not initialize_orm_tables():
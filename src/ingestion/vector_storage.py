@@ -4,6 +4,7 @@ import logging
 import os
 from typing import List, Optional, Tuple
 from dotenv import load_dotenv
+from src.cache import chunk_cache, chunk_count_cache, path_cache
 from src.database.connections import postgres_conn
 from src.models.schemas import LearningChunk
 
@@ -101,6 +102,10 @@ class VectorStorage:
                 raise ValueError("Failed to insert chunk - no ID returned")
             
             chunk_id = result[0]['id']
+            chunk_cache.invalidate(concept_tag.strip().lower())
+            chunk_count_cache.invalidate(concept_tag.strip().lower())
+            # Cached paths embed time estimates built from these counts
+            path_cache.clear()
             # logger.info(f"Stored chunk {chunk_id} for concept '{concept_tag}' from '{doc_source}'")
             return chunk_id
             
@@ -169,7 +174,12 @@ class VectorStorage:
                 
                 if result:
                     chunk_ids.append(result[0]['id'])
+                    chunk_cache.invalidate(concept_tag.strip().lower())
+                    chunk_count_cache.invalidate(concept_tag.strip().lower())
             
+            if chunk_ids:
+                # Cached paths embed time estimates built from these counts
+                path_cache.clear()
             logger.info(f"Stored {len(chunk_ids)} chunks in batch")
             return chunk_ids
             
@@ -329,6 +339,10 @@ class VectorStorage:
         try:
             query = "DELETE FROM learning_chunks WHERE concept_tag = %s"
             deleted_count = self.db_conn.execute_query(query, (concept_tag.strip().lower(),))
+            chunk_cache.invalidate(concept_tag.strip().lower())
+            chunk_count_cache.invalidate(concept_tag.strip().lower())
+            # Cached paths embed time estimates built from these counts
+            path_cache.clear()
             
             logger.info(f"Deleted {deleted_count} chunks for concept '{concept_tag}'")
             return deleted_count
@@ -349,6 +363,10 @@ class VectorStorage:
         try:
             query = "DELETE FROM learning_chunks WHERE document_id = %s"
             deleted_count = self.db_conn.execute_query(query, (document_id,))
+            # Affected concepts are unknown here, so drop everything
+            chunk_cache.clear()
+            chunk_count_cache.clear()
+            path_cache.clear()
             
             logger.info(f"Deleted {deleted_count} chunks for document {document_id}")
             return deleted_count
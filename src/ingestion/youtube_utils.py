@@ -1,11 +1,40 @@
+import os
 import re
+import time
+import tempfile
+import asyncio
 import logging
+import httpx
 import requests
-from typing import List, Optional
+from requests.adapters import HTTPAdapter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib3.util.retry import Retry
 import yt_dlp
 
+from src.config import settings
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson not installed
+    from json import loads as _json_loads
+
 logger = logging.getLogger(__name__)
 
+_BARE_ID_RE = re.compile(r"[0-9A-Za-z_-]{11}")
+_YT_ID_RE = re.compile(r"(?:v=|/embed/|/v/|/shorts/|youtu\.be/)([0-9A-Za-z_-]{11})")
+_WS_RE = re.compile(r"\s+")
+
+TIMEDTEXT_URL = "https://www.youtube.com/api/timedtext"
+
+# Shared session so batch ingestion reuses keep-alive connections
+_HTTP = requests.Session()
+_HTTP.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
 def extract_video_id(url: str) -> Optional[str]:
     """
     Extract the 11-character YouTube video ID from various URL formats.
@@ -15,33 +44,60 @@ def extract_video_id(url: str) -> Optional[str]:
     - https://youtu.be/VIDEO_ID
     - https://www.youtube.com/embed/VIDEO_ID
     - https://www.youtube.com/v/VIDEO_ID
+    - https://www.youtube.com/shorts/VIDEO_ID
+    - VIDEO_ID (already extracted)
     """
     if not url:
         return None
-        
-    patterns = [
-        r"(?:v=|\/embed\/|\/v\/|youtu\.be\/)([0-9A-Za-z_-]{11})",
-        r"youtube\.com\/watch\?.*v=([0-9A-Za-z_-]{11})"
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-            
-    return None
 
-def fetch_transcript(video_id: str, languages: List[str] = ['en', 'en-US']) -> Optional[str]:
+    if _BARE_ID_RE.fullmatch(url):
+        return url
+
+    match = _YT_ID_RE.search(url)
+    return match.group(1) if match else None
+
+def _json3_to_text(data: dict) -> str:
+    """Flatten a JSON3 caption payload into whitespace-normalized text."""
+    parts = []
+    for event in data.get('events', []):
+        parts.extend(
+            seg['utf8'] for seg in event.get('segs', []) if seg.get('utf8')
+        )
+    return _WS_RE.sub(' ', ''.join(parts)).strip()
+
+def _timedtext_attempts(languages: List[str]) -> List[Tuple[str, Optional[str]]]:
+    """
+    (lang, kind) pairs to try, in order: manual captions in every preferred
+    language first, then auto-generated (ASR) ones, mirroring yt-dlp's fallback.
     """
-    Fetch the transcript for a YouTube video using yt-dlp for reliability.
+    return [(lang, kind) for kind in (None, 'asr') for lang in languages]
+
+def _fast_fetch_timedtext(video_id: str, lang: str, kind: Optional[str] = None) -> Optional[str]:
+    """
+    Fetch one caption track straight from YouTube's timedtext endpoint.
+    
+    Skips yt-dlp's player extraction entirely.
     
     Args:
-        video_id: The 11-character YouTube video ID.
-        languages: List of preferred language codes in descending order of priority.
-        
+        kind: None for manual captions, 'asr' for auto-generated ones.
+    
     Returns:
-        Formatted transcript text or None if fetching fails.
+        Transcript text, or None if the endpoint has nothing for this track.
     """
+    params = {'lang': lang, 'v': video_id, 'fmt': 'json3'}
+    if kind:
+        params['kind'] = kind
+    try:
+        resp = _HTTP.get(TIMEDTEXT_URL, params=params, timeout=5)
+        if resp.status_code != 200 or not resp.content:
+            return None
+        return _json3_to_text(_json_loads(resp.content)) or None
+    except (requests.RequestException, ValueError) as e:
+        logger.debug(f"timedtext fetch failed for {video_id} ({lang}): {str(e)}")
+        return None
+
+def _fetch_transcript_ytdlp(video_id: str, languages: List[str]) -> Optional[str]:
+    """Discover the caption track via yt-dlp and download its JSON3 payload."""
     url = f"https://www.youtube.com/watch?v={video_id}"
     
     ydl_opts = {
@@ -50,6 +106,9 @@ def fetch_transcript(video_id: str, languages: List[str] = ['en', 'en-US']) -> O
         'skip_download': True,
         'quiet': True,
         'no_warnings': True,
+        'socket_timeout': 10,
+        # The android client skips the web player's signature handling
+        'extractor_args': {'youtube': {'player_client': ['android']}},
     }
 
     try:
@@ -93,22 +152,151 @@ def fetch_transcript(video_id: str, languages: List[str] = ['en', 'en-US']) -> O
                 return None
                 
             # Fetch the actual content
-            resp = requests.get(json3_url)
+            resp = _HTTP.get(json3_url, timeout=10)
             resp.raise_for_status()
             
-            data = resp.json()
-            events = data.get('events', [])
-            full_text = ""
-            for event in events:
-                segs = event.get('segs', [])
-                for seg in segs:
-                    full_text += seg.get('utf8', '')
-            
-            # Normalize whitespace
-            full_text = re.sub(r'\s+', ' ', full_text).strip()
-            
-            return full_text
+            return _json3_to_text(_json_loads(resp.content))
             
     except Exception as e:
         logger.error(f"Failed to fetch YouTube transcript for {video_id} with yt-dlp: {str(e)}")
         return None
+
+def _transcript_cache_path(video_id: str, languages: List[str]) -> Path:
+    """Cache file for a (video, language preference) pair."""
+    return Path(settings.transcript_cache_dir) / f"{video_id}_{'+'.join(languages)}.txt"
+
+def _read_cached_transcript(video_id: str, languages: List[str]) -> Optional[str]:
+    """Return a cached transcript if caching is enabled and the entry is fresh."""
+    if not settings.transcript_cache_enabled:
+        return None
+    path = _transcript_cache_path(video_id, languages)
+    try:
+        if time.time() - path.stat().st_mtime > settings.transcript_cache_ttl:
+            return None
+        return path.read_text(encoding='utf-8')
+    except OSError:
+        return None
+
+def _write_cached_transcript(video_id: str, languages: List[str], text: str):
+    """
+    Persist a transcript; cache failures are logged and otherwise ignored.
+    
+    Written to a temp file in the cache directory and renamed into place, so
+    concurrent readers never see a partially written entry.
+    """
+    if not settings.transcript_cache_enabled:
+        return
+    path = _transcript_cache_path(video_id, languages)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+    except OSError as e:
+        logger.warning(f"Could not cache transcript for {video_id}: {str(e)}")
+
+def fetch_transcript(video_id: str, languages: List[str] = ['en', 'en-US']) -> Optional[str]:
+    """
+    Fetch the transcript for a YouTube video.
+    
+    Results are cached on disk per (video, languages) for
+    settings.transcript_cache_ttl seconds. On a miss the timedtext endpoint is
+    tried directly, manual captions in each preferred language before any
+    auto-generated ones, falling back to yt-dlp track discovery when that
+    yields nothing.
+    
+    Args:
+        video_id: The 11-character YouTube video ID.
+        languages: List of preferred language codes in descending order of priority.
+        
+    Returns:
+        Formatted transcript text or None if fetching fails.
+    """
+    cached = _read_cached_transcript(video_id, languages)
+    if cached is not None:
+        logger.info(f"Using cached transcript for video: {video_id}")
+        return cached
+
+    for lang, kind in _timedtext_attempts(languages):
+        text = _fast_fetch_timedtext(video_id, lang, kind)
+        if text:
+            logger.info(f"Fetched transcript for video: {video_id} ({lang}) via timedtext")
+            break
+    else:
+        text = _fetch_transcript_ytdlp(video_id, languages)
+
+    if text:
+        _write_cached_transcript(video_id, languages, text)
+    return text
+
+async def _fetch_timedtext_async(client: httpx.AsyncClient, video_id: str, lang: str, kind: Optional[str] = None) -> Optional[str]:
+    """Async counterpart of _fast_fetch_timedtext sharing a pooled client."""
+    params = {'lang': lang, 'v': video_id, 'fmt': 'json3'}
+    if kind:
+        params['kind'] = kind
+    try:
+        resp = await client.get(TIMEDTEXT_URL, params=params)
+        if resp.status_code != 200 or not resp.content:
+            return None
+        return _json3_to_text(_json_loads(resp.content)) or None
+    except (httpx.HTTPError, ValueError) as e:
+        logger.debug(f"timedtext fetch failed for {video_id} ({lang}): {str(e)}")
+        return None
+
+async def fetch_transcripts_bulk(
+    video_ids: List[str],
+    languages: List[str] = ['en', 'en-US'],
+    concurrency: int = 8
+) -> Dict[str, Optional[str]]:
+    """
+    Fetch transcripts for many videos concurrently (e.g. a playlist).
+    
+    Cached transcripts are returned without any network traffic. Timedtext
+    requests overlap up to `concurrency` at a time. Videos the endpoint
+    has no captions for fall back to yt-dlp in a worker thread. A failure on one
+    video never affects the others.
+    
+    Args:
+        video_ids: 11-character YouTube video IDs.
+        languages: List of preferred language codes in descending order of priority.
+        concurrency: Maximum number of videos fetched at once.
+        
+    Returns:
+        Mapping of video ID to transcript text (None where fetching failed).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=32, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=5) as client:
+        async def _one(video_id: str) -> Optional[str]:
+            cached = _read_cached_transcript(video_id, languages)
+            if cached is not None:
+                return cached
+
+            async with semaphore:
+                try:
+                    for lang, kind in _timedtext_attempts(languages):
+                        text = await _fetch_timedtext_async(client, video_id, lang, kind)
+                        if text:
+                            break
+                    else:
+                        text = await asyncio.to_thread(_fetch_transcript_ytdlp, video_id, languages)
+                except Exception as e:
+                    logger.error(f"Failed to fetch YouTube transcript for {video_id}: {str(e)}")
+                    return None
+
+            if text:
+                _write_cached_transcript(video_id, languages, text)
+            return text
+
+        results = await asyncio.gather(*(_one(vid) for vid in video_ids))
+
+    return dict(zip(video_ids, results))
@@ -1,5 +1,6 @@
 """Pydantic models for LearnFast Core Engine data structures."""
 
+import sys
 from datetime import datetime
 from typing import List, Optional, Dict, Any, Union
 
@@ -41,6 +42,16 @@ class ConceptNode(BaseModel):
     description: Optional[str] = Field(None, description="Concept description")
     depth_level: Optional[int] = Field(None, description="Depth in prerequisite hierarchy")
 
+    @property
+    def name_lc(self) -> str:
+        """Normalized (stripped, lowercase, interned) name, derived from name so it never goes stale."""
+        return sys.intern(self.name.strip().lower())
+
+    @classmethod
+    def bulk(cls, names: List[str]) -> List["ConceptNode"]:
+        """Build nodes for trusted names without per-instance validation (model_construct)."""
+        return [cls.model_construct(name=name) for name in names]
+
 
 class UserNode(BaseModel):
     """Represents a user node in the knowledge graph."""
@@ -8,6 +8,7 @@ import logging
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from src.cache import path_cache
 from src.database.connections import neo4j_conn
 from src.models.schemas import UserState, UserNode
 from src.database.graph_storage import graph_storage
@@ -141,6 +142,8 @@ class UserProgressTracker:
                 "concept_name": normalized_concept
             })
             
+            # Completed concepts drop out of this user's resolved paths
+            path_cache.invalidate_where(lambda key: key[0] == user_id)
             logger.info(f"User {user_id} completed concept {normalized_concept}")
             return True
             
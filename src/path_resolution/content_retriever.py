@@ -1,9 +1,12 @@
+import io
 import logging
 import json
 import os
-from typing import List, Dict, Any, Optional
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 
+from src.cache import chunk_cache
 from src.database.connections import postgres_conn
 from src.models.schemas import LearningChunk
 from src.services.llm_service import llm_service
@@ -15,6 +18,8 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+_MISS = object()
+
 
 class ContentRetriever:
     """
@@ -87,9 +92,21 @@ Example format:
 
 Return ONLY the JSON object, no other text:"""
 
+    CHUNKS_BY_CONCEPTS_STATEMENT = "lc_by_concepts"
+
     def __init__(self):
         """Initialize the content retriever."""
         self.connection = postgres_conn
+        self.connection.prepare(
+            self.CHUNKS_BY_CONCEPTS_STATEMENT,
+            """
+                SELECT id, doc_source, content, concept_tag, created_at
+                FROM learning_chunks
+                WHERE lower(concept_tag) = ANY($1)
+                ORDER BY id ASC
+            """,
+            ("text[]",)
+        )
 
     def _calculate_flashcard_count(self, time_budget_minutes: int) -> int:
         """
@@ -99,10 +116,23 @@ Return ONLY the JSON object, no other text:"""
         count = max(3, min(10, time_budget_minutes // 3))
         return count
 
+    @staticmethod
+    def _to_chunk(row: Dict[str, Any]) -> LearningChunk:
+        """Build a validated LearningChunk from a learning_chunks row."""
+        return LearningChunk(
+            id=row['id'],
+            doc_source=row['doc_source'],
+            content=row['content'],
+            concept_tag=row['concept_tag'],
+            created_at=row['created_at']
+        )
+
     def retrieve_chunks_by_concept(self, concept: str) -> List[LearningChunk]:
         """
         Retrieve all content chunks associated with a specific concept.
         
+        Rows are served from the shared in-process chunk cache when fresh.
+        
         Args:
             concept: Concept name
             
@@ -111,32 +141,85 @@ Return ONLY the JSON object, no other text:"""
         """
         if not concept:
             return []
-            
+
+        return self.retrieve_chunks_by_concepts([concept]).get(concept.lower(), [])
+
+    def _fetch_chunk_rows(self, concepts: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch learning_chunks rows for several concepts in a single query.
+        
+        Concepts already in the chunk cache are not queried again.
+        
+        Returns:
+            Dict mapping lowercased concept name to its rows, ordered by id.
+            Concepts without chunks are absent from the dict.
+        """
+        normalized = list({c.lower() for c in concepts if c})
+
+        rows_by_concept = {}
+        missing = []
+        for concept in normalized:
+            cached = chunk_cache.get(concept, _MISS)
+            if cached is _MISS:
+                missing.append(concept)
+            elif cached:
+                rows_by_concept[concept] = cached
+
+        if not missing:
+            return rows_by_concept
+
         try:
-            query = """
-                SELECT id, doc_source, content, concept_tag, created_at
-                FROM learning_chunks
-                WHERE lower(concept_tag) = lower(%s)
-                ORDER BY id ASC
-            """
-            
-            results = self.connection.execute_query(query, (concept,))
-            
-            chunks = []
+            results = self.connection.execute_prepared(self.CHUNKS_BY_CONCEPTS_STATEMENT, (missing,))
+
+            fetched = defaultdict(list)
             for row in results:
-                chunks.append(LearningChunk(
-                    id=row['id'],
-                    doc_source=row['doc_source'],
-                    content=row['content'],
-                    concept_tag=row['concept_tag'],
-                    created_at=row['created_at']
-                ))
-                
-            return chunks
-            
+                fetched[row['concept_tag'].lower()].append(row)
+
+            for concept in missing:
+                rows = fetched.get(concept, [])
+                chunk_cache.set(concept, rows)
+                if rows:
+                    rows_by_concept[concept] = rows
+
         except Exception as e:
-            logger.error(f"Error retrieving chunks for concept '{concept}': {str(e)}")
-            return []
+            logger.error(f"Error retrieving chunks for concepts {missing}: {str(e)}")
+
+        return rows_by_concept
+
+    def retrieve_chunks_by_concepts(self, concepts: List[str]) -> Dict[str, List[LearningChunk]]:
+        """
+        Retrieve content chunks for several concepts in a single query.
+        
+        Args:
+            concepts: Concept names
+            
+        Returns:
+            Dict mapping lowercased concept name to its LearningChunk objects,
+            ordered by id. Concepts without chunks are absent from the dict.
+        """
+        return {
+            concept: [self._to_chunk(row) for row in rows]
+            for concept, rows in self._fetch_chunk_rows(concepts).items()
+        }
+
+    def retrieve_contents_by_concepts(self, concepts: List[str]) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Retrieve (doc_source, content) pairs for several concepts.
+        
+        Lesson assembly only needs these two fields, so this skips building
+        and validating a LearningChunk per row.
+        
+        Args:
+            concepts: Concept names
+            
+        Returns:
+            Dict mapping lowercased concept name to (doc_source, content) tuples,
+            ordered by id. Concepts without chunks are absent from the dict.
+        """
+        return {
+            concept: [(row['doc_source'], row['content']) for row in rows]
+            for concept, rows in self._fetch_chunk_rows(concepts).items()
+        }
 
     def _get_cached_lesson(self, concept_name: str, time_budget: int) -> Optional[str]:
         """Check if a lesson is already cached."""
@@ -313,8 +396,6 @@ Return ONLY the JSON object, no other text:"""
                 return cached
 
         # 2. Gather All Raw Content (Filtering out mastered concepts)
-        lesson_parts = []
-        
         # We process the target concept AND its prerequisites traversing the path?
         # Typically the path includes prereqs. 
         # We prune prereqs if they are in completed_concepts.
@@ -330,13 +411,23 @@ Return ONLY the JSON object, no other text:"""
 
         logger.info(f"Generating lesson for {target_concept}. Pruned {len(path_concepts) - len(relevant_concepts)} concepts.")
 
+        # Stream numbered chunk sections into one buffer instead of building
+        # a str per chunk and joining at the end
+        buf = io.StringIO()
+        write = buf.write
+        section = 0
+        contents_by_concept = self.retrieve_contents_by_concepts(relevant_concepts)
         for concept in relevant_concepts:
-            chunks = self.retrieve_chunks_by_concept(concept)
-            for chunk in chunks:
+            for doc_source, content in contents_by_concept.get(concept.lower(), []):
+                if section:
+                    write("\n\n")
+                section += 1
                 # Add explicit concept label for LLM
-                lesson_parts.append(f"Source: {chunk.doc_source} (Concept: {concept})\nContent: ```\n{chunk.content}\n```")
+                write(f"### {section}\nSource: {doc_source} (Concept: {concept})\nContent: ```\n")
+                write(content)
+                write("\n```")
         
-        raw_full_content = "\n\n".join([f"### {i+1}\n{part}" for i,part in enumerate(lesson_parts)])
+        raw_full_content = buf.getvalue()
 
         if not raw_full_content.strip():
             # No chunks exist - generate lesson from scratch
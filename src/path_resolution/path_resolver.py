@@ -5,15 +5,49 @@ Handles generation of optimized learning paths, time estimation, and constraint
 """
 
 import logging
-from typing import List, Optional, Tuple
+import sys
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+from src.cache import chunk_count_cache, path_cache
 from src.database.connections import neo4j_conn, postgres_conn
 from src.models.schemas import LearningPath
 from src.navigation.navigation_engine import NavigationEngine
 
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # numba not installed, pruning stays pure Python
+    njit = None
+
 logger = logging.getLogger(__name__)
 
 # Constants
 MINUTES_PER_CHUNK = 2
+# Below this many concepts the JIT call overhead outweighs the loop it replaces
+NUMBA_MIN_PATH_LENGTH = 256
+
+
+def _prune_cutoff(concept_times: List[int], time_limit: int) -> Tuple[int, int]:
+    """Length and total time of the longest prefix of concept_times that fits in time_limit."""
+    # Times are non-negative, so the prefix sums are non-decreasing and the longest
+    # prefix within the limit ends where bisect_right places the limit
+    cumulative = list(accumulate(concept_times))
+    cutoff = bisect_right(cumulative, time_limit)
+    return cutoff, cumulative[cutoff - 1] if cutoff else 0
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _prune_kernel(concept_times, time_limit):
+        """Compiled equivalent of _prune_cutoff for long paths."""
+        total = 0
+        for i in range(concept_times.shape[0]):
+            next_total = total + concept_times[i]
+            if next_total > time_limit:
+                return i, total
+            total = next_total
+        return concept_times.shape[0], total
 
 
 class PathResolver:
@@ -21,12 +55,83 @@ class PathResolver:
     Resolves optimized learning paths based on user state and constraints.
     """
     
-    def __init__(self):
-        """Initialize the path resolver."""
-        self.connection = neo4j_conn
-        self.pg_connection = postgres_conn
+    __slots__ = ("connection", "pg_connection", "navigation", "_chunk_cache", "_path_cache")
+    
+    CHUNK_COUNTS_STATEMENT = "resolver_chunk_counts"
+    
+    def __init__(self, connection=None, pg_connection=None):
+        """
+        Initialize the path resolver.
+        
+        Args:
+            connection: Neo4j connection; defaults to the shared neo4j_conn
+            pg_connection: PostgreSQL connection; defaults to the shared postgres_conn
+        """
+        self.connection = connection or neo4j_conn
+        self.pg_connection = pg_connection or postgres_conn
         self.navigation = NavigationEngine()
+        self.pg_connection.prepare(
+            self.CHUNK_COUNTS_STATEMENT,
+            """
+                SELECT lower(concept_tag) AS concept, count(*) AS chunk_count
+                FROM learning_chunks
+                WHERE lower(concept_tag) = ANY($1)
+                GROUP BY lower(concept_tag)
+            """,
+            ("text[]",)
+        )
+        # Per-concept chunk counts, shared process-wide and invalidated by VectorStorage writes
+        self._chunk_cache = chunk_count_cache
+        # Resolved paths, shared process-wide and invalidated by graph and progress writes
+        self._path_cache = path_cache
         
+    def invalidate(self, concept: Optional[str] = None):
+        """
+        Drop the cached chunk count for a concept, or every cached count and
+        resolved path if none is given.
+        """
+        if concept is None:
+            self._chunk_cache.clear()
+            self._path_cache.clear()
+        else:
+            self._chunk_cache.invalidate(concept.strip().lower())
+        
+    def _fetch_missing(self, concepts: List[str]) -> Dict[str, int]:
+        """Return chunk counts for normalized concepts, querying and caching only the uncached ones."""
+        counts = {}
+        missing = []
+        for concept in concepts:
+            cached = self._chunk_cache.get(concept)
+            if cached is None:
+                missing.append(concept)
+            else:
+                counts[concept] = cached
+        if not missing:
+            return counts
+            
+        rows = self.pg_connection.execute_prepared(self.CHUNK_COUNTS_STATEMENT, (missing,))
+        
+        fetched = dict.fromkeys(missing, 0)
+        for row in rows or []:
+            fetched[row['concept']] = row['chunk_count']
+        for concept, count in fetched.items():
+            self._chunk_cache.set(concept, count)
+        counts.update(fetched)
+        return counts
+        
+    def get_chunk_counts(self, concepts: List[str]) -> Dict[str, int]:
+        """
+        Count learning chunks per concept, querying only the uncached ones in a single query.
+        
+        Args:
+            concepts: List of concept names
+            
+        Returns:
+            Mapping of lowercased concept name to chunk count (0 if it has none)
+        """
+        normalized_concepts = list(dict.fromkeys(sys.intern(c.lower()) for c in concepts))
+        return self._fetch_missing(normalized_concepts)
+
     def estimate_learning_time(self, concepts: List[str]) -> int:
         """
         Estimate learning time for a list of concepts.
@@ -39,36 +144,24 @@ class PathResolver:
         Returns:
             Estimated time in minutes
         """
-        if not concepts:
-            return 0
-            
         try:
-            # We need to count chunks for these concepts from PostgreSQL
-            # We can do this in one query
-            placeholders = ",".join(["%s"] * len(concepts))
-            query = f"""
-                SELECT count(*) as chunk_count 
-                FROM learning_chunks 
-                WHERE lower(concept_tag) IN ({placeholders})
-            """
-            
-            # Normalize names for query
-            normalized_concepts = [c.lower() for c in concepts]
-            
-            result = self.pg_connection.execute_query(query, tuple(normalized_concepts))
-            
-            if result and result[0]:
-                chunk_count = result[0]['chunk_count']
-                return max(1, chunk_count) * MINUTES_PER_CHUNK
-            
-            # If no chunks found, return a baseline instead of 0
-            return MINUTES_PER_CHUNK
-            
+            return self._estimate_learning_time(concepts)
         except Exception as e:
             logger.error(f"Error estimating time for concepts: {str(e)}")
             # Fallback: return 0 or default? Let's return 0 and log error
             return 0
 
+    def _estimate_learning_time(self, concepts: List[str]) -> int:
+        """estimate_learning_time without the fallback; lookup errors propagate."""
+        if not concepts:
+            return 0
+            
+        counts = self.get_chunk_counts(concepts)
+        chunk_count = sum(counts.values())
+        
+        # If no chunks found, return a baseline instead of 0
+        return max(1, chunk_count) * MINUTES_PER_CHUNK
+
     def resolve_path(self, user_id: str, target_concept: str, time_budget_minutes: int) -> Optional[LearningPath]:
         """
         Find an optimized learning path from user's current state to the target concept,
@@ -85,6 +178,25 @@ class PathResolver:
         if not user_id or not target_concept:
             return None
             
+        cache_key = (user_id, target_concept.strip().lower(), time_budget_minutes)
+        cached = self._path_cache.get(cache_key)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+            
+        path, cacheable = self._resolve_path_uncached(user_id, target_concept, time_budget_minutes)
+        # Failures, degraded estimates and missing paths aren't cached so they are retried next time
+        if path is not None and cacheable:
+            self._path_cache.set(cache_key, path.model_copy(deep=True))
+        return path
+
+    def _resolve_path_uncached(self, user_id: str, target_concept: str, time_budget_minutes: int) -> Tuple[Optional[LearningPath], bool]:
+        """
+        Compute resolve_path's result without consulting the path cache.
+        
+        Returns:
+            Tuple of (path, cacheable); cacheable is False when the time
+            estimate fell back to 0 because chunk counts could not be fetched
+        """
         try:
             normalized_target = target_concept.strip().lower()
             
@@ -137,7 +249,7 @@ class PathResolver:
                 
                 if not result:
                     logger.warning(f"No path found to {target_concept}")
-                    return None
+                    return None, False
                 else:
                     full_path_names = result[0]['concepts']
             
@@ -173,10 +285,17 @@ class PathResolver:
                     estimated_time_minutes=0, 
                     target_concept=normalized_target,
                     pruned=False
-                )
+                ), True
 
             # 3. Calculate time for active path
-            total_time = self.estimate_learning_time(active_path)
+            cacheable = True
+            try:
+                total_time = self._estimate_learning_time(active_path)
+            except Exception as e:
+                logger.error(f"Error estimating time for concepts: {str(e)}")
+                # Same 0-minute fallback as estimate_learning_time, but don't cache it
+                total_time = 0
+                cacheable = False
             
             # 4. Prune if exceeds budget
             pruned = False
@@ -207,11 +326,11 @@ class PathResolver:
                 estimated_time_minutes=total_time,
                 target_concept=normalized_target,
                 pruned=pruned
-            )
+            ), cacheable
             
         except Exception as e:
             logger.error(f"Error resolving path for {target_concept}: {str(e)}")
-            return None
+            return None, False
 
     def prune_path_by_time(self, path: List[str], time_limit: int) -> Tuple[List[str], int]:
         """
@@ -227,17 +346,20 @@ class PathResolver:
         if not path:
             return [], 0
             
-        current_path = []
-        current_time = 0
-        
-        for concept in path:
-            concept_time = self.estimate_learning_time([concept])
+        # One query for the whole path; the cutoff below makes no DB calls
+        try:
+            # Normalize each name once; the lookups below then hash interned strings
+            normalized_path = [sys.intern(c.lower()) for c in path]
+            counts = self._fetch_missing(list(dict.fromkeys(normalized_path)))
+            # Same per-concept baseline as estimate_learning_time([concept])
+            concept_times = [max(1, counts[c]) * MINUTES_PER_CHUNK for c in normalized_path]
+        except Exception as e:
+            logger.error(f"Error fetching chunk counts for pruning: {str(e)}")
+            concept_times = [0] * len(path)
             
-            if current_time + concept_time <= time_limit:
-                current_path.append(concept)
-                current_time += concept_time
-            else:
-                # Cannot fit this concept
-                break
-                
-        return current_path, current_time
+        if njit is not None and len(path) >= NUMBA_MIN_PATH_LENGTH:
+            cutoff, total = _prune_kernel(np.asarray(concept_times, dtype=np.int64), time_limit)
+            return path[:int(cutoff)], int(total)
+            
+        cutoff, total = _prune_cutoff(concept_times, time_limit)
+        return path[:cutoff], total
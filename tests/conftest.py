@@ -0,0 +1,14 @@
+"""
+Shared pytest configuration.
+
+Hypothesis profiles: "ci" (default) keeps property tests cheap and
+reproducible for PR runs, "nightly" searches deeper with fresh randomness.
+Select one with HYPOTHESIS_PROFILE=nightly.
+"""
+import os
+
+from hypothesis import settings
+
+settings.register_profile("ci", max_examples=10, derandomize=True, deadline=None)
+settings.register_profile("nightly", max_examples=200, deadline=None)
+settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "ci"))
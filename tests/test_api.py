@@ -10,19 +10,23 @@ from unittest.mock import MagicMock, patch
 from main import app
 from src.models.schemas import LearningPath
 
-client = TestClient(app)
+@pytest.fixture(scope="class")
+def client():
+    """One TestClient per class so the app lifespan runs once, not per request."""
+    with TestClient(app) as c:
+        yield c
 
 class TestApiIntegration:
     """Integration tests for API endpoints."""
     
-    def test_root_endpoint(self):
+    def test_root_endpoint(self, client):
         """Test the root endpoint returns 200."""
         response = client.get("/")
         assert response.status_code == 200
         assert "message" in response.json()
 
     @patch("main.navigation_engine")
-    def test_get_root_concepts(self, mock_nav):
+    def test_get_root_concepts(self, mock_nav, client):
         """Test getting root concepts."""
         # Setup mock
         mock_nav.find_root_concepts.return_value = ["concept_a", "concept_b"]
@@ -42,7 +46,7 @@ class TestApiIntegration:
         assert response.json() == ["concept_a", "concept_b"]
 
     @patch("main.user_tracker")
-    def test_progress_workflow(self, mock_tracker):
+    def test_progress_workflow(self, mock_tracker, client):
         """Test start and complete progress points."""
         mock_tracker.mark_in_progress.return_value = True
         mock_tracker.mark_completed.return_value = True
@@ -62,7 +66,7 @@ class TestApiIntegration:
         assert "Completed" in resp2.json()["message"]
 
     @patch("main.path_resolver")
-    def test_learning_path_generation(self, mock_resolver):
+    def test_learning_path_generation(self, mock_resolver, client):
         """Test learning path endpoint."""
         # Setup mock response
         mock_path = LearningPath(
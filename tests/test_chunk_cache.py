@@ -0,0 +1,114 @@
+
+import pytest
+from unittest.mock import MagicMock
+from src.cache import TTLCache, chunk_cache, chunk_count_cache, path_cache
+from src.ingestion.vector_storage import VectorStorage
+from src.path_resolution.content_retriever import ContentRetriever
+from src.path_resolution.path_resolver import PathResolver
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture(autouse=True)
+def empty_chunk_cache():
+    chunk_cache.clear()
+    chunk_count_cache.clear()
+    path_cache.clear()
+    yield
+    chunk_cache.clear()
+    chunk_count_cache.clear()
+    path_cache.clear()
+
+def _row(chunk_id, tag):
+    return {"id": chunk_id, "doc_source": "doc", "content": f"content {chunk_id}", "concept_tag": tag, "created_at": None}
+
+def test_ttl_cache_expiry_and_lru_eviction():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, timer=clock)
+    missing = object()
+
+    cache.set("a", [])
+    cache.set("b", [1])
+    assert cache.get("a", missing) == []  # falsy values are real hits; also marks "a" recently used
+
+    cache.set("c", [2])  # evicts least recently used ("b")
+    assert cache.get("b", missing) is missing
+    assert cache.get("c") == [2]
+
+    clock.now = 11
+    assert cache.get("a", missing) is missing
+
+def test_ttl_cache_invalidate_where():
+    cache = TTLCache(maxsize=10, ttl=10)
+    cache.set(("u1", "a", 60), 1)
+    cache.set(("u1", "b", 60), 2)
+    cache.set(("u2", "a", 60), 3)
+
+    cache.invalidate_where(lambda key: key[0] == "u1")
+    assert len(cache) == 1
+    assert cache.get(("u2", "a", 60)) == 3
+
+def test_batched_retrieval_only_queries_uncached_concepts():
+    retriever = ContentRetriever()
+    retriever.connection = MagicMock()
+    retriever.connection.execute_prepared.return_value = [_row(1, "alpha")]
+
+    first = retriever.retrieve_chunks_by_concepts(["Alpha", "beta"])
+    assert [c.id for c in first["alpha"]] == [1]
+    assert "beta" not in first
+
+    # Both concepts (including the empty one) are now cached
+    retriever.connection.execute_prepared.reset_mock()
+    second = retriever.retrieve_chunks_by_concepts(["alpha", "beta"])
+    assert second.keys() == {"alpha"}
+    retriever.connection.execute_prepared.assert_not_called()
+
+    # Invalidation forces a refetch of just that concept
+    chunk_cache.invalidate("beta")
+    retriever.connection.execute_prepared.return_value = [_row(2, "beta")]
+    third = retriever.retrieve_chunks_by_concepts(["alpha", "beta"])
+    assert [c.id for c in third["beta"]] == [2]
+    args, _ = retriever.connection.execute_prepared.call_args
+    assert args[1] == (["beta"],)
+
+def test_contents_and_chunks_share_cached_rows():
+    retriever = ContentRetriever()
+    retriever.connection = MagicMock()
+    retriever.connection.execute_prepared.return_value = [_row(1, "alpha"), _row(2, "alpha")]
+
+    contents = retriever.retrieve_contents_by_concepts(["alpha"])
+    assert contents == {"alpha": [("doc", "content 1"), ("doc", "content 2")]}
+
+    chunks = retriever.retrieve_chunks_by_concepts(["alpha"])
+    assert [c.id for c in chunks["alpha"]] == [1, 2]
+    assert retriever.connection.execute_prepared.call_count == 1
+
+def test_chunk_counts_only_query_uncached_concepts():
+    resolver = PathResolver(pg_connection=MagicMock())
+    resolver.pg_connection.execute_prepared.return_value = [{"concept": "alpha", "chunk_count": 3}]
+
+    assert resolver.get_chunk_counts(["Alpha", "beta"]) == {"alpha": 3, "beta": 0}
+
+    # Repeat lookups (including the zero count) are served from the cache
+    resolver.pg_connection.execute_prepared.reset_mock()
+    assert resolver.estimate_learning_time(["alpha", "beta"]) == 6
+    resolver.pg_connection.execute_prepared.assert_not_called()
+
+    resolver.invalidate("Beta")
+    resolver.pg_connection.execute_prepared.return_value = [{"concept": "beta", "chunk_count": 2}]
+    assert resolver.get_chunk_counts(["alpha", "beta"]) == {"alpha": 3, "beta": 2}
+    resolver.pg_connection.execute_prepared.assert_called_once_with(PathResolver.CHUNK_COUNTS_STATEMENT, (["beta"],))
+
+def test_chunk_deletes_drop_cached_counts_and_paths():
+    storage = VectorStorage(db_connection=MagicMock())
+    storage.db_conn.execute_query.return_value = 2
+    chunk_count_cache.set("alpha", 2)
+    path_cache.set(("u1", "alpha", 60), object())
+
+    assert storage.delete_chunks_by_concept("Alpha") == 2
+    assert chunk_count_cache.get("alpha") is None
+    assert len(path_cache) == 0
@@ -0,0 +1,29 @@
+import pytest
+from unittest.mock import MagicMock
+from src.database.graph_storage import GraphStorage
+from src.models.schemas import ConceptNode
+
+def _storage():
+    storage = GraphStorage()
+    storage.connection = MagicMock()
+    storage.connection.execute_query.return_value = [{"count": 2}]
+    return storage
+
+def test_concepts_batch_is_one_unwind_query():
+    """All concepts go to Neo4j in a single round trip, normalized, with provenance and labels."""
+    storage = _storage()
+    nodes = [ConceptNode(name=" Alpha "), ConceptNode(name="beta", description="b"), ConceptNode.bulk(["  "])[0]]
+
+    assert storage.store_concepts_batch(nodes, document_id=7, extra_labels=["TestNode_x"]) == 2
+
+    storage.connection.execute_query.assert_called_once()
+    query, params = storage.connection.execute_query.call_args.args
+    assert "UNWIND $concepts" in query and "SET c:`TestNode_x`" in query
+    assert [row["name"] for row in params["concepts"]] == ["alpha", "beta"]
+    assert params["doc_id"] == 7
+
+def test_concepts_batch_rejects_bad_labels():
+    storage = _storage()
+    with pytest.raises(ValueError):
+        storage.store_concepts_batch([ConceptNode(name="a")], extra_labels=["bad label"])
+    storage.connection.execute_query.assert_not_called()
@@ -25,19 +25,25 @@ class TestNavigationEngine:
         except Exception:
             pass
         cls.session_id = str(uuid.uuid4())[:8]
+        # Checked once here rather than on every Hypothesis example
+        try:
+            cls._constraints_ok = graph_storage.verify_constraints()
+        except Exception:
+            cls._constraints_ok = False
         
-    def teardown_method(self):
-        """Clean up after each test."""
+    @classmethod
+    def teardown_class(cls):
+        """Clean up everything this class created; examples use unique prefixes so nothing collides meanwhile."""
         try:
-            # Clean up session data
             graph_storage.connection.execute_write_query(
-                f"MATCH (n) WHERE n.name STARTS WITH 'test_{self.session_id}_' OR n.uid STARTS WITH 'user_{self.session_id}_' DETACH DELETE n"
+                "MATCH (n) WHERE n.name STARTS WITH $name_prefix OR n.uid STARTS WITH $uid_prefix DETACH DELETE n",
+                {"name_prefix": f"test_{cls.session_id}_", "uid_prefix": f"user_{cls.session_id}_"}
             )
         except Exception:
             pass
 
     @given(st.lists(st.text(min_size=1, max_size=10, alphabet=st.characters(whitelist_categories=('L',))), min_size=1, max_size=5))
-    @settings(max_examples=50, deadline=None)
+    @settings(deadline=None)
     def test_root_concept_identification(self, concept_names):
         """
         **Feature: learnfast-core-engine, Property 6: Root concept identification**
@@ -45,7 +51,7 @@ class TestNavigationEngine:
         
         Concepts with no prerequisites must be identified as root concepts.
         """
-        if not graph_storage.verify_constraints():
+        if not self._constraints_ok:
             pytest.skip("Database constraints not active")
             
         test_id = str(uuid.uuid4())[:8]
@@ -66,7 +72,7 @@ class TestNavigationEngine:
             assert name in roots, f"Concept {name} should be a root concept"
 
     @given(depth=st.integers(min_value=1, max_value=5))
-    @settings(max_examples=20, deadline=None)
+    @settings(deadline=None)
     def test_path_preview_depth(self, depth):
         """
         **Feature: learnfast-core-engine, Property 7: Path preview depth constraint**
@@ -83,14 +89,16 @@ class TestNavigationEngine:
         nodes = [ConceptNode(name=name) for name in concepts]
         graph_storage.store_concepts_batch(nodes)
         
-        for i in range(chain_len - 1):
-            link = PrerequisiteLink(
+        links = [
+            PrerequisiteLink(
                 source_concept=concepts[i],
                 target_concept=concepts[i+1],
                 weight=1.0,
                 reasoning="chain"
             )
-            graph_storage.store_prerequisite_relationship(link)
+            for i in range(chain_len - 1)
+        ]
+        graph_storage.store_prerequisite_relationships_batch(links)
             
         root = concepts[0]
         preview = nav_engine.get_path_preview(root, depth=depth)
@@ -105,7 +113,7 @@ class TestNavigationEngine:
             assert preview[i] == concepts[i].lower(), f"Preview order mismatch at index {i}"
 
     @given(st.data())
-    @settings(max_examples=50, deadline=None)
+    @settings(deadline=None)
     def test_prerequisite_validation(self, data):
         """
         **Feature: learnfast-core-engine, Property 8: Prerequisite completion validation**
@@ -113,7 +121,7 @@ class TestNavigationEngine:
         
         A concept is only valid if all its prerequisites are completed.
         """
-        if not graph_storage.verify_constraints():
+        if not self._constraints_ok:
             pytest.skip("Database constraints not active")
             
         test_id = str(uuid.uuid4())[:8]
@@ -148,7 +156,7 @@ class TestNavigationEngine:
             "Dependent concept should be valid after prereq completed"
 
     @given(st.data())
-    @settings(max_examples=50, deadline=None)
+    @settings(deadline=None)
     def test_progress_persistence(self, data):
         """
         **Feature: learnfast-core-engine, Property 15: Progress state persistence**
@@ -156,7 +164,7 @@ class TestNavigationEngine:
         
         User progress (IN_PROGRESS, COMPLETED) must be persisted correctly.
         """
-        if not graph_storage.verify_constraints():
+        if not self._constraints_ok:
             pytest.skip("Database constraints not active")
             
         test_id = str(uuid.uuid4())[:8]
@@ -184,7 +192,7 @@ class TestNavigationEngine:
         assert concept.lower() in state.completed_concepts
 
     @given(st.data())
-    @settings(max_examples=50, deadline=None)
+    @settings(deadline=None)
     def test_available_concepts_consistency(self, data):
         """
         **Feature: learnfast-core-engine, Property 9: Available concept state consistency**
@@ -192,7 +200,7 @@ class TestNavigationEngine:
         
         Available concepts must always be consistent with user progress and prerequisites.
         """
-        if not graph_storage.verify_constraints():
+        if not self._constraints_ok:
             pytest.skip("Database constraints not active")
             
         test_id = str(uuid.uuid4())[:8]
@@ -0,0 +1,122 @@
+
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from src.database.connections import PostgreSQLConnection
+
+def _fake_psycopg_connection():
+    """A psycopg2-like connection whose cursor records executed SQL."""
+    conn = MagicMock()
+    conn.closed = False
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.description = [("id",)]
+    cursor.fetchall.return_value = [{"id": 1}]
+    return conn, cursor
+
+def test_prepared_statement_is_prepared_once_per_connection():
+    """PREPARE runs on first use only, and again after a reconnect."""
+    conn, cursor = _fake_psycopg_connection()
+    pg = PostgreSQLConnection()
+    pg.prepare("by_tag", "SELECT id FROM learning_chunks WHERE concept_tag = $1", ("text",))
+
+    with patch("src.database.connections.psycopg2.connect", return_value=conn):
+        assert pg.execute_prepared("by_tag", ("a",)) == [{"id": 1}]
+        assert pg.execute_prepared("by_tag", ("b",)) == [{"id": 1}]
+
+        executed = [c.args[0] for c in cursor.execute.call_args_list]
+        assert executed.count("PREPARE by_tag(text) AS SELECT id FROM learning_chunks WHERE concept_tag = $1") == 1
+        assert executed.count("EXECUTE by_tag(%s)") == 2
+
+        # A new session must re-prepare
+        conn.closed = True
+        new_conn, new_cursor = _fake_psycopg_connection()
+        with patch("src.database.connections.psycopg2.connect", return_value=new_conn):
+            pg.execute_prepared("by_tag", ("c",))
+        assert new_cursor.execute.call_args_list[0].args[0].startswith("PREPARE by_tag")
+
+def test_execute_prepared_does_not_commit():
+    """EXECUTE of a registered read leaves the transaction alone; only the PREPARE commits."""
+    conn, cursor = _fake_psycopg_connection()
+    pg = PostgreSQLConnection()
+    pg.prepare("by_tag", "SELECT id FROM learning_chunks WHERE concept_tag = $1", ("text",))
+
+    with patch("src.database.connections.psycopg2.connect", return_value=conn):
+        pg.execute_prepared("by_tag", ("a",))
+        pg.execute_prepared("by_tag", ("b",))
+
+    conn.commit.assert_called_once()
+
+def test_concurrent_first_use_prepares_once():
+    """Threads racing on a statement's first use must not PREPARE it twice."""
+    conn, cursor = _fake_psycopg_connection()
+
+    def slow_execute(query, params=None):
+        if query.startswith("PREPARE"):
+            time.sleep(0.05)
+    cursor.execute.side_effect = slow_execute
+
+    pg = PostgreSQLConnection()
+    pg.prepare("by_tag", "SELECT id FROM learning_chunks WHERE concept_tag = $1", ("text",))
+
+    with patch("src.database.connections.psycopg2.connect", return_value=conn):
+        threads = [threading.Thread(target=pg.execute_prepared, args=("by_tag", ("a",))) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    executed = [c.args[0] for c in cursor.execute.call_args_list]
+    assert sum(q.startswith("PREPARE") for q in executed) == 1
+    assert executed.count("EXECUTE by_tag(%s)") == 4
+
+def test_execute_prepared_requires_registration():
+    pg = PostgreSQLConnection()
+    with pytest.raises(KeyError):
+        pg.execute_prepared("missing", ("x",))
+
+def test_execute_query_stream_uses_server_side_cursor():
+    """Rows come from a named cursor fetched itersize at a time."""
+    conn, cursor = _fake_psycopg_connection()
+    cursor.__iter__.return_value = iter([{"id": 1}, {"id": 2}])
+    pg = PostgreSQLConnection()
+
+    with patch("src.database.connections.psycopg2.connect", return_value=conn):
+        rows = list(pg.execute_query_stream("SELECT id FROM learning_chunks", itersize=100))
+
+    assert rows == [{"id": 1}, {"id": 2}]
+    assert conn.cursor.call_args.kwargs["name"].startswith("stream_")
+    assert cursor.itersize == 100
+    # A read-only stream ends its transaction with a rollback, not a commit
+    conn.commit.assert_not_called()
+    conn.rollback.assert_called_once()
+
+def test_execute_query_stream_cleans_up_when_closed_early():
+    """Abandoning the generator still ends the transaction on the shared connection."""
+    conn, cursor = _fake_psycopg_connection()
+    cursor.__iter__.return_value = iter([{"id": 1}, {"id": 2}])
+    pg = PostgreSQLConnection()
+
+    with patch("src.database.connections.psycopg2.connect", return_value=conn):
+        rows = pg.execute_query_stream("SELECT id FROM learning_chunks")
+        assert next(rows) == {"id": 1}
+        rows.close()
+
+    conn.cursor.return_value.__exit__.assert_called_once()
+    conn.rollback.assert_called_once()
+
+@pytest.mark.parametrize("existing, dropped", [(None, False), ({"indisvalid": True}, False), ({"indisvalid": False}, True)])
+def test_lower_concept_tag_index_migration_rebuilds_invalid_index(existing, dropped):
+    """A half-built (INVALID) index from an interrupted concurrent build is dropped and recreated."""
+    from src.database.init_db import migrate_learning_chunks_indexes
+    conn, cursor = _fake_psycopg_connection()
+    cursor.fetchone.return_value = existing
+
+    with patch("src.database.init_db.postgres_conn") as pg:
+        pg.connect.return_value = conn
+        assert migrate_learning_chunks_indexes() is True
+
+    executed = [c.args[0] for c in cursor.execute.call_args_list]
+    assert any(q.startswith("DROP INDEX CONCURRENTLY") for q in executed) == dropped
+    assert executed[-1].startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS learning_chunks_concept_tag_lower_idx")
+    assert conn.autocommit is False
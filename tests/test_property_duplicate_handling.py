@@ -27,7 +27,8 @@ class TestDuplicateHandling:
         try:
             # Clear any existing test data for this session
             graph_storage.connection.execute_write_query(
-                f"MATCH (n:Concept) WHERE n.name STARTS WITH 'test_{self.session_id}_' DETACH DELETE n"
+                "MATCH (n:Concept) WHERE n.name STARTS WITH $prefix DETACH DELETE n",
+                {"prefix": f"test_{self.session_id}_"}
             )
         except Exception:
             pass  # Ignore cleanup errors
@@ -37,7 +38,8 @@ class TestDuplicateHandling:
         try:
             # Clear test data for this session
             graph_storage.connection.execute_write_query(
-                f"MATCH (n:Concept) WHERE n.name STARTS WITH 'test_{self.session_id}_' DETACH DELETE n"
+                "MATCH (n:Concept) WHERE n.name STARTS WITH $prefix DETACH DELETE n",
+                {"prefix": f"test_{self.session_id}_"}
             )
         except Exception:
             pass  # Ignore cleanup errors
@@ -81,7 +83,8 @@ class TestDuplicateHandling:
             
             # Query all created concepts for this test iteration
             result = graph_storage.connection.execute_query(
-                f"MATCH (c:Concept) WHERE c.name STARTS WITH 'test_{self.session_id}_{test_id}_' RETURN c.name as name"
+                "MATCH (c:Concept) WHERE c.name STARTS WITH $prefix RETURN c.name as name",
+                {"prefix": f"test_{self.session_id}_{test_id}_"}
             )
             
             created_names = [record['name'] for record in result]
@@ -125,7 +128,8 @@ class TestDuplicateHandling:
             # Clean up this test iteration's data
             try:
                 graph_storage.connection.execute_write_query(
-                    f"MATCH (n:Concept) WHERE n.name STARTS WITH 'test_{self.session_id}_{test_id}_' DETACH DELETE n"
+                    "MATCH (n:Concept) WHERE n.name STARTS WITH $prefix DETACH DELETE n",
+                    {"prefix": f"test_{self.session_id}_{test_id}_"}
                 )
             except Exception:
                 pass  # Ignore cleanup errors
@@ -195,11 +199,11 @@ class TestDuplicateHandling:
                     continue  # Some may fail due to duplicates, which is expected
             
             # Query the actual relationships in the database
-            result = graph_storage.connection.execute_query(f"""
+            result = graph_storage.connection.execute_query("""
                 MATCH (source:Concept)-[r:PREREQUISITE]->(target:Concept)
-                WHERE source.name STARTS WITH 'test_{self.session_id}_{test_id}_'
+                WHERE source.name STARTS WITH $prefix
                 RETURN source.name as source, target.name as target, r.weight as weight
-            """)
+            """, {"prefix": f"test_{self.session_id}_{test_id}_"})
             
             # Property: Each unique concept pair should have exactly one relationship
             relationship_pairs = set()
@@ -225,7 +229,8 @@ class TestDuplicateHandling:
             # Clean up this test iteration's data
             try:
                 graph_storage.connection.execute_write_query(
-                    f"MATCH (n:Concept) WHERE n.name STARTS WITH 'test_{self.session_id}_{test_id}_' DETACH DELETE n"
+                    "MATCH (n:Concept) WHERE n.name STARTS WITH $prefix DETACH DELETE n",
+                    {"prefix": f"test_{self.session_id}_{test_id}_"}
                 )
             except Exception:
                 pass  # Ignore cleanup errors
@@ -27,7 +27,8 @@ class TestProjectInitialization:
         try:
             # Clear any existing test data for this session
             neo4j_conn.execute_write_query(
-                f"MATCH (n:Concept) WHERE n.name STARTS WITH 'test_{self.session_id}_' DETACH DELETE n"
+                "MATCH (n:Concept) WHERE n.name STARTS WITH $prefix DETACH DELETE n",
+                {"prefix": f"test_{self.session_id}_"}
             )
         except Exception:
             pass  # Ignore cleanup errors
@@ -37,7 +38,8 @@ class TestProjectInitialization:
         try:
             # Clear test data for this session
             neo4j_conn.execute_write_query(
-                f"MATCH (n:Concept) WHERE n.name STARTS WITH 'test_{self.session_id}_' DETACH DELETE n"
+                "MATCH (n:Concept) WHERE n.name STARTS WITH $prefix DETACH DELETE n",
+                {"prefix": f"test_{self.session_id}_"}
             )
         except Exception:
             pass  # Ignore cleanup errors
@@ -86,7 +88,8 @@ class TestProjectInitialization:
             
             # Query all created concepts for this test iteration
             result = neo4j_conn.execute_query(
-                f"MATCH (c:Concept) WHERE c.name STARTS WITH 'test_{self.session_id}_{test_id}_' RETURN c.name as name"
+                "MATCH (c:Concept) WHERE c.name STARTS WITH $prefix RETURN c.name as name",
+                {"prefix": f"test_{self.session_id}_{test_id}_"}
             )
             
             created_names = [record['name'] for record in result]
@@ -114,7 +117,8 @@ class TestProjectInitialization:
             # Clean up this test iteration's data
             try:
                 neo4j_conn.execute_write_query(
-                    f"MATCH (n:Concept) WHERE n.name STARTS WITH 'test_{self.session_id}_{test_id}_' DETACH DELETE n"
+                    "MATCH (n:Concept) WHERE n.name STARTS WITH $prefix DETACH DELETE n",
+                    {"prefix": f"test_{self.session_id}_{test_id}_"}
                 )
             except Exception:
                 pass  # Ignore cleanup errors
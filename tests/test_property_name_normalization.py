@@ -12,6 +12,7 @@ version, and normalizing twice should produce the same result as normalizing onc
 from hypothesis import given, strategies as st, settings
 
 from src.ingestion.ingestion_engine import IngestionEngine
+from src.models.schemas import ConceptNode
 
 
 # Strategy for generating concept names with mixed case
@@ -102,3 +103,30 @@ def test_normalize_preserves_content(name: str):
     
     assert normalized == expected, \
         f"Normalization altered content: expected '{expected}', got '{normalized}'"
+
+
+@settings(max_examples=100)
+@given(name=concept_names_mixed_case)
+def test_concept_node_name_lc_matches_engine_normalization(name: str):
+    """
+    Property: ConceptNode.name_lc is the engine's normalized name, whether the node is
+    validated or built in bulk, and it stays out of serialized output.
+    """
+    engine = IngestionEngine()
+    expected = engine._normalize_concept_name(name)
+    
+    node = ConceptNode(name=name)
+    bulk_node, = ConceptNode.bulk([name])
+    
+    assert node.name_lc == expected
+    assert bulk_node.name_lc == expected
+    assert "name_lc" not in node.model_dump()
+    assert "name_lc" not in ConceptNode.model_json_schema()["properties"]
+
+
+def test_concept_node_name_lc_follows_renames():
+    """name_lc is derived from name, so renamed or copied nodes never keep the old value."""
+    node = ConceptNode(name="A")
+    node.name = "B "
+    assert node.name_lc == "b"
+    assert ConceptNode(name="A").model_copy(update={"name": "C"}).name_lc == "c"
@@ -1,12 +1,20 @@
 
+import json
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock, patch, AsyncMock
 from main import app
-from src.ingestion.youtube_utils import extract_video_id
+from src.config import settings
+from src.ingestion.youtube_utils import extract_video_id, fetch_transcript, fetch_transcripts_bulk
 
 client = TestClient(app)
 
+@pytest.fixture(autouse=True)
+def isolated_transcript_cache(tmp_path, monkeypatch):
+    """Keep transcript cache writes out of the working tree."""
+    monkeypatch.setattr(settings, "transcript_cache_dir", str(tmp_path / "transcripts"))
+    monkeypatch.setattr(settings, "transcript_cache_enabled", True)
+
 def test_extract_video_id():
     """Test extracting video ID from various YouTube URL formats."""
     urls = [
@@ -16,13 +24,102 @@ def test_extract_video_id():
         "https://www.youtube.com/v/dQw4w9WgXcQ",
         "https://youtube.com/watch?v=dQw4w9WgXcQ&feature=shared",
         "http://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://www.youtube.com/watch?feature=shared&v=dQw4w9WgXcQ",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+        "dQw4w9WgXcQ",
     ]
     for url in urls:
         assert extract_video_id(url) == "dQw4w9WgXcQ"
         
     assert extract_video_id("https://google.com") is None
+    # A trailing newline is not part of a bare ID
+    assert extract_video_id("dQw4w9WgXcQ\n") is None
     assert extract_video_id("") is None
 
+@patch("src.ingestion.youtube_utils.yt_dlp.YoutubeDL")
+@patch("src.ingestion.youtube_utils._HTTP.get")
+def test_fetch_transcript_timedtext_fast_path(mock_get, mock_ydl):
+    """The timedtext endpoint is used directly when it returns captions."""
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.content = json.dumps({
+        "events": [{"segs": [{"utf8": "Hello"}, {"utf8": "\n"}]}, {"segs": [{"utf8": " world "}]}]
+    }).encode()
+
+    assert fetch_transcript("dQw4w9WgXcQ") == "Hello world"
+    mock_ydl.assert_not_called()
+
+@patch("src.ingestion.youtube_utils._fetch_transcript_ytdlp")
+@patch("src.ingestion.youtube_utils._fast_fetch_timedtext")
+def test_fetch_transcript_prefers_manual_captions(mock_timedtext, mock_ytdlp):
+    """Manual captions in any preferred language win over auto-generated ones."""
+    tracks = {("en", "asr"): "auto en", ("en-US", None): "manual en-US"}
+    mock_timedtext.side_effect = lambda video_id, lang, kind=None: tracks.get((lang, kind))
+
+    assert fetch_transcript("dQw4w9WgXcQ", ["en", "en-US"]) == "manual en-US"
+    assert [c.args[1:] for c in mock_timedtext.call_args_list] == [("en", None), ("en-US", None)]
+    mock_ytdlp.assert_not_called()
+
+@patch("src.ingestion.youtube_utils._fetch_transcript_ytdlp")
+@patch("src.ingestion.youtube_utils._HTTP.get")
+def test_fetch_transcript_falls_back_to_ytdlp(mock_get, mock_ytdlp):
+    """yt-dlp is only consulted when timedtext has nothing."""
+    mock_get.return_value.status_code = 404
+    mock_get.return_value.content = b""
+    mock_ytdlp.return_value = "Fallback transcript"
+
+    assert fetch_transcript("dQw4w9WgXcQ", ["en"]) == "Fallback transcript"
+    mock_ytdlp.assert_called_once_with("dQw4w9WgXcQ", ["en"])
+
+@patch("src.ingestion.youtube_utils._fetch_transcript_ytdlp")
+@patch("src.ingestion.youtube_utils._fast_fetch_timedtext")
+def test_fetch_transcript_uses_disk_cache(mock_timedtext, mock_ytdlp):
+    """A second fetch for the same video and languages skips the network."""
+    mock_timedtext.return_value = "Cached transcript"
+
+    assert fetch_transcript("dQw4w9WgXcQ", ["en"]) == "Cached transcript"
+    assert fetch_transcript("dQw4w9WgXcQ", ["en"]) == "Cached transcript"
+    assert mock_timedtext.call_count == 1
+
+    # Disabling the cache forces a refetch
+    settings.transcript_cache_enabled = False
+    fetch_transcript("dQw4w9WgXcQ", ["en"])
+    assert mock_timedtext.call_count == 2
+    mock_ytdlp.assert_not_called()
+
+@patch("src.ingestion.youtube_utils._fetch_transcript_ytdlp")
+@patch("src.ingestion.youtube_utils._fast_fetch_timedtext")
+def test_transcript_cache_write_leaves_no_temp_files(mock_timedtext, mock_ytdlp, tmp_path):
+    """Entries are renamed into place, so only the final file remains."""
+    mock_timedtext.return_value = "Cached transcript"
+
+    fetch_transcript("dQw4w9WgXcQ", ["en"])
+    fetch_transcript("dQw4w9WgXcQ", ["en", "en-US"])
+    assert sorted(p.name for p in (tmp_path / "transcripts").iterdir()) == [
+        "dQw4w9WgXcQ_en+en-US.txt", "dQw4w9WgXcQ_en.txt"
+    ]
+
+@pytest.mark.asyncio
+@patch("src.ingestion.youtube_utils._fetch_transcript_ytdlp")
+@patch("src.ingestion.youtube_utils._fetch_timedtext_async")
+async def test_fetch_transcripts_bulk_isolates_failures(mock_timedtext, mock_ytdlp):
+    """Each video resolves independently; one failure does not sink the batch."""
+    async def timedtext(client, video_id, lang, kind=None):
+        if video_id == "broken00000":
+            raise RuntimeError("boom")
+        return f"text for {video_id}" if video_id != "nocaptions0" else None
+
+    mock_timedtext.side_effect = timedtext
+    mock_ytdlp.return_value = None
+
+    results = await fetch_transcripts_bulk(["aaaaaaaaaaa", "broken00000", "nocaptions0"], ["en"])
+
+    assert results == {
+        "aaaaaaaaaaa": "text for aaaaaaaaaaa",
+        "broken00000": None,
+        "nocaptions0": None,
+    }
+    mock_ytdlp.assert_called_once_with("nocaptions0", ["en"])
+
 @patch("main.document_store")
 @patch("main.ingestion_engine")
 @patch("main.fetch_transcript")